@@ -1,8 +1,11 @@
-from io import BytesIO
 import logging
 import sys
-from utils import convert_bun_version_into_pybun_version, get_latest_bun_version
-from http.client import HTTPSConnection
+from io import BytesIO
+from utils import (
+    cached_get,
+    convert_bun_version_into_pybun_version,
+    get_latest_bun_version,
+)
 import xml.etree.ElementTree as std_xml
 
 
@@ -10,19 +13,18 @@ logger = logging.getLogger("pybun")
 
 
 def get_latest_pybun_version() -> str:
-    host = "pypi.org"
-    conn = HTTPSConnection(host)
-    try:
-        conn.request("GET", "/rss/project/pybun/releases.xml", headers={"Host": host})
-        response = conn.getresponse()
-        assert response.status == 200
-        content = response.read()
-    finally:
-        conn.close()
-
-    tree = std_xml.parse(BytesIO(content))
-    latest_pybun_version = tree.getroot().find("channel/item/title").text
-    return latest_pybun_version
+    feed = cached_get("https://pypi.org/rss/project/pybun/releases.xml")
+
+    # The feed lists every release: stop at the first <title> inside the
+    # first <item> instead of parsing the whole document into a tree.
+    in_item = False
+    for event, element in std_xml.iterparse(BytesIO(feed), events=("start", "end")):
+        if event == "start" and element.tag == "item":
+            in_item = True
+        elif event == "end" and in_item and element.tag == "title":
+            return element.text
+
+    raise ValueError("No release found in the pybun RSS feed")
 
 
 def main():
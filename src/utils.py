@@ -1,16 +1,64 @@
 # pyright: strict
-from http.client import HTTPSConnection
+import os
+from hashlib import sha256
+from pathlib import Path
 
+import urllib3
 
-def get_latest_bun_version() -> str:
-    host = "github.com"
-    conn = HTTPSConnection(host)
+# One pool for every HTTPS call made by the release tooling: make_wheels.py
+# reuses it too, so the GitHub and PyPI requests of a single run share
+# persistent connections instead of paying a TLS handshake per call.
+HTTP_POOL = urllib3.PoolManager(maxsize=8, retries=urllib3.Retry(3, backoff_factor=0.3))
+
+
+def get_cache_dir() -> Path:
+    xdg_cache_home = os.environ.get("XDG_CACHE_HOME", "")
+    base_dir = Path(xdg_cache_home) if xdg_cache_home else Path.home() / ".cache"
+    return base_dir / "pybun"
+
+
+def cached_get(url: str) -> bytes:
+    """GET a URL through an ETag-based conditional request.
+
+    When the resource has not changed since the last fetch, the server
+    answers 304 with an empty body and the cached copy is returned: repeated
+    CI polls of an unchanged resource cost a round-trip and nothing else.
+    """
+    key = sha256(url.encode("utf-8")).hexdigest()
+    http_cache_dir = get_cache_dir() / "http"
+    etag_path = http_cache_dir / f"{key}.etag"
+    body_path = http_cache_dir / f"{key}.body"
+
+    headers: dict[str, str] = {}
     try:
-        conn.request("GET", "/oven-sh/bun/releases/latest", headers={"Host": host})
-        response = conn.getresponse()
-        location_header = response.headers["location"]
-    finally:
-        conn.close()
+        headers["If-None-Match"] = etag_path.read_text()
+        cached_body = body_path.read_bytes()
+    except OSError:
+        headers.clear()
+        cached_body = None
+
+    response = HTTP_POOL.request("GET", url, headers=headers)
+    if response.status == 304 and cached_body is not None:
+        return cached_body
+
+    assert response.status == 200, f"GET {url} answered {response.status}"
+
+    etag = response.headers.get("etag")
+    if etag:
+        http_cache_dir.mkdir(parents=True, exist_ok=True)
+        # The body is written before the validator so a stale ETag can only
+        # trigger a harmless full re-fetch, never serve a stale body.
+        body_path.write_bytes(response.data)
+        etag_path.write_text(etag)
+
+    return response.data
+
+
+def get_latest_bun_version() -> str:
+    response = HTTP_POOL.request(
+        "GET", "https://github.com/oven-sh/bun/releases/latest", redirect=False
+    )
+    location_header = response.headers["location"]
 
     latest_version = location_header.replace(
         "https://github.com/oven-sh/bun/releases/tag/bun-", ""